@@ -1,25 +1,432 @@
+import cProfile
+import hashlib
+import json
+import os
+import pstats
 import re
-from typing import Dict, List, Union
+import sys
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from itertools import accumulate, compress, count
+from operator import sub
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
-def analyze_javascript_code(code_content: str) -> Dict:
+try:
+    import re2
+except ImportError:  # google-re2 is optional; fall back to the standard library engine
+    re2 = None
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional; presence checks then run one search per pattern
+    hyperscan = None
+
+if re2 is not None:
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.log_errors = False
+
+def _range_text(runs: List[Tuple[int, int]]) -> str:
+    """Write code point runs as character class ranges in \\x{...} syntax."""
+    ranges = []
+    for first, last in runs:
+        # Leave out surrogates, which never occur in text RE2 or Hyperscan can scan
+        for start, end in ((first, min(last, 0xD7FF)), (max(first, 0xE000), last)):
+            if start == end:
+                ranges.append(f'\\x{{{start:x}}}')
+            elif start < end:
+                ranges.append(f'\\x{{{start:x}}}-\\x{{{end:x}}}')
+    return ''.join(ranges)
+
+def _build_class_escape_ranges() -> Dict[str, Tuple[str, str]]:
+    """Map 's', 'w' and 'd' to Python's Unicode (members, non-members) of that class escape."""
+    # Every code point in order, so match offsets are code points
+    code_points = array('I', range(sys.maxunicode + 1)).tobytes().decode('utf-32-le', 'surrogatepass')
+    class_ranges = {}
+    for escape in 'swd':
+        members = [(run.start(), run.end() - 1) for run in re.finditer(f'\\{escape}+', code_points)]
+        bounds = [-1] + [bound for run in members for bound in run] + [sys.maxunicode + 1]
+        non_members = [(bounds[k] + 1, bounds[k + 1] - 1) for k in range(0, len(bounds), 2) if bounds[k] + 1 < bounds[k + 1]]
+        class_ranges[escape] = (_range_text(members), _range_text(non_members))
+    return class_ranges
+
+def _class_escape_ranges() -> Dict[str, Tuple[str, str]]:
+    """Return the class escape ranges, building them once per Unicode database version.
+
+    Scanning every code point takes a noticeable part of the import, so the result is kept in
+    __pycache__ and only rebuilt when Python's Unicode data changes.
+    """
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__')
+    cache_path = os.path.join(cache_dir, f'analyzer-class-escapes-{unicodedata.unidata_version}.json')
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            class_ranges = json.load(f)
+        return {escape: (class_ranges[escape][0], class_ranges[escape][1]) for escape in 'swd'}
+    except (OSError, ValueError, KeyError, IndexError, TypeError):
+        pass
+
+    class_ranges = _build_class_escape_ranges()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write under a unique name and rename, so concurrent imports never read a partial file
+        temp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(class_ranges, f)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass  # Read-only install; the ranges are rebuilt on the next import
+    return class_ranges
+
+# Only built when an optional engine will need it
+_CLASS_ESCAPE_RANGES = _class_escape_ranges() if re2 is not None or hyperscan is not None else {}
+
+def _unicode_classes(pattern: str) -> str:
+    """Spell out \\s, \\w and \\d (and their negations) as the code points Python's re matches.
+
+    RE2 and Hyperscan read these escapes as ASCII-only, so without this a file's score would
+    depend on which optional engine is installed.
+    """
+    parts = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\' and i + 1 < len(pattern):
+            escape = pattern[i + 1]
+            if escape.lower() in _CLASS_ESCAPE_RANGES:
+                members, non_members = _CLASS_ESCAPE_RANGES[escape.lower()]
+                ranges = non_members if escape.isupper() else members
+                parts.append(ranges if in_class else f'[{ranges}]')
+            else:
+                parts.append(pattern[i:i + 2])
+            i += 2
+        elif char == '[' and not in_class:
+            # A ']' right after '[' or '[^' is a member, not the end of the class
+            end = i + 1
+            if pattern.startswith('^', end):
+                end += 1
+            if pattern.startswith(']', end):
+                end += 1
+            parts.append(pattern[i:end])
+            in_class = True
+            i = end
+        else:
+            if char == ']':
+                in_class = False
+            parts.append(char)
+            i += 1
+    return ''.join(parts)
+
+class _RE2Pattern:
+    """An RE2 pattern with an re twin for text RE2 cannot take.
+
+    RE2 encodes its input as strict UTF-8, so text with lone surrogates raises
+    UnicodeEncodeError; such text is matched with the standard library instead.
+    """
+    __slots__ = ('pattern', '_re2', '_re')
+    
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self._re2 = re2.compile(_unicode_classes(pattern), _RE2_OPTIONS)
+        self._re = re.compile(pattern)
+    
+    def search(self, string: str):
+        try:
+            return self._re2.search(string)
+        except UnicodeEncodeError:
+            return self._re.search(string)
+    
+    def findall(self, string: str) -> List:
+        try:
+            return self._re2.findall(string)
+        except UnicodeEncodeError:
+            return self._re.findall(string)
+    
+    def finditer(self, string: str) -> List:
+        # RE2's finditer only encodes once iterated, so collect the matches here
+        try:
+            return list(self._re2.finditer(string))
+        except UnicodeEncodeError:
+            return list(self._re.finditer(string))
+
+def _compile(pattern: str):
+    """Compile a pattern with RE2 (linear-time matching) when available, otherwise with re."""
+    if re2 is not None:
+        try:
+            return _RE2Pattern(pattern)
+        except re2.error:
+            pass  # Syntax RE2 does not support, such as lookaround
+    return re.compile(pattern)
+
+# Fast mode (ANALYZER_DETAILED=0) skips the repeated-block detector and the operator spacing
+# scan, the two most expensive checks, and charges a fixed midrange penalty for each instead.
+# Scores are then approximate: repetitive or inconsistently spaced code is not told apart.
+_DETAILED = os.getenv("ANALYZER_DETAILED", "1") == "1"
+_FAST_MODE_REPEATED_BLOCKS_PENALTY = 5
+_FAST_MODE_SPACING_PENALTY = 2
+
+# ANALYZER_PROFILE=1 prints a cProfile report of every uncached analysis to stderr
+_PROFILE = os.getenv("ANALYZER_PROFILE") == "1"
+
+# Most recent analysis results, keyed by (blake2b digest of the source, file extension, detailed).
+# Each process keeps its own, and callers may analyze from several threads.
+_RESULT_CACHE = OrderedDict()
+_RESULT_CACHE_SIZE = 256
+_RESULT_CACHE_LOCK = threading.Lock()
+
+# Precompiled patterns shared by the analyzers and recommendation generators.
+# Probes that are plain literals are kept as tuples of substrings instead of regexes.
+_JS_NON_CAMEL_VAR = _compile(r'(?:let|const|var)\s+([A-Z][a-zA-Z0-9]*|[a-z]+_[a-zA-Z0-9_]*)\s*=')
+_JS_NON_PASCAL_COMPONENT = _compile(r'function\s+([a-z][a-zA-Z0-9]*)\s*\(\s*(?:props|{)')
+_JS_NON_CAPS_CONST = _compile(r'const\s+([a-z][a-zA-Z0-9]*)\s*=\s*["\'\d\[]')
+_JS_MIXED_STYLE = _compile(r'(?:let|const|var)\s+([a-z][a-zA-Z0-9]*_[a-zA-Z0-9]*|[a-z][a-zA-Z0-9]*-[a-zA-Z0-9]*)')
+_JS_FUNCTION_DEF = _compile(r'(?:function\s+\w+\s*\(.*?\)\s*{|const\s+\w+\s*=\s*(?:\(.*?\)|.*?)\s*=>\s*{|\(\s*\)\s*=>\s*{)')
+# A single-character class cannot backtrack, and RE2's per-match overhead makes it much slower here
+_JS_BRACE = re.compile(r'[{}]')
+_JS_FUNCTION_NAME = _compile(r'(?:function\s+(\w+)|const\s+(\w+)\s*=)')
+_JS_UTILITY_FUNCTION = _compile(r'(?:export\s+)?(?:function|const)\s+(?:use[A-Z]|format|convert|transform|calculate|get|is|has)')
+_JS_MODERN_FEATURE = ('const', 'let', '=>', 'async', 'await', '.map(', '.filter(', '.reduce(')
+_JS_USE_EFFECT_NO_DEPS = _compile(r'useEffect\([^,]+\)')
+_JS_ADD_LISTENER = ('addEventListener(',)
+_JS_REMOVE_LISTENER = ('removeEventListener(',)
+_JS_TRY_BLOCK = _compile(r'try\s*{')
+_JS_ASYNC_CALL = ('fetch', 'axios', '.then(')
+_JS_INTERACTIVE_ELEMENT = ('<img', '<input', '<button')
+_JS_A11Y_ATTRIBUTE = ('alt', 'aria-', 'role')
+_JS_UNSAFE_CALL = ('innerHTML', 'dangerouslySetInnerHTML', 'eval(')
+_JSDOC = _compile(r'/\*\*[\s\S]*?\*/')
+_JS_FUNCTION_KEYWORD = _compile(r'function\s+|const\s+\w+\s*=\s*(?:function|\(.*?\)\s*=>)')
+
+_PY_FUNCTION_DEF = _compile(r'(?m)(?:^|\s)def\s+([a-zA-Z0-9_]+)\s*\(')
+_PY_NON_SNAKE_VAR = _compile(r'(?:^|\s)([a-z][a-z0-9]*[A-Z][a-zA-Z0-9]*)\s*=')
+_PY_NON_UPPER_CONST = _compile(r'(?:^|\s)([a-z][a-zA-Z0-9_]*)\s*=\s*(?:["\'0-9\[]|True|False|None)')
+_PY_MAIN_GUARD = _compile(r'if\s+__name__\s*==\s*["\']__main__["\']')
+_PY_NON_CAMEL_CLASS = _compile(r'class\s+([a-z][a-zA-Z0-9_]*)')
+_PY_MIXED_STYLE = _compile(r'(?:^|\s)([a-z][a-zA-Z0-9]*[A-Z][a-zA-Z0-9]*_[a-zA-Z0-9_]*)')
+_PY_UTILITY_FUNCTION = _compile(r'def\s+(?:format|convert|transform|calculate|get|is|has|validate)')
+_PY_PARAM_TYPE_HINT = _compile(r'def\s+\w+\([^)]*:\s*\w+')
+_PY_RETURN_TYPE_HINT = _compile(r'def\s+\w+\([^)]*\)\s*->\s*\w+')
+_PY_RESPONSE_MODEL = ('response_model', 'BaseModel')
+_PY_HTTP_ERROR = ('HTTPException', 'status.')
+_PY_TRY_BLOCK = _compile(r'try\s*:')
+_PY_IO_CALL = ('requests.', 'open(', 'json.')
+_PY_DOCSTRING = ('"""',)
+_PY_UNSAFE_CALL = ('eval(', 'exec(', 'subprocess.')
+_PY_OPEN_CALL = ('open(',)
+_PY_WITH_OPEN = _compile(r'with\s+open\(')
+_PY_DEF_KEYWORD = _compile(r'def\s+')
+_PY_CLASS_KEYWORD = _compile(r'class\s+')
+
+# Line prefixes analyze_comments counts as comments
+_COMMENT_PREFIXES = ('//', '#', '/*', '*')
+
+_HARDCODED_VALUE = _compile(r'[^A-Za-z0-9_](?:\d{3,}|"[^"]{10,}"|\'[^\']{10,}\')')
+
+# An operator between two alphanumerics, capturing the whitespace on each side. The right
+# operand is a lookahead so it can start the next match (as in "a=b+c"); RE2 has no lookahead.
+_OPERATOR_SPACING = re.compile(r'[a-zA-Z0-9](\s*)(==|!=|>=|<=|[-+*/=])(\s*)(?=[a-zA-Z0-9])')
+
+# Checks that only need to know whether a pattern occurs at all, as (signal name, pattern),
+# where the pattern is a compiled regex or a tuple of literals any of which may occur.
+# A signal listed more than once is set when any of its patterns occurs.
+_JS_PRESENCE_CHECKS = (
+    ("has_modern_features", _JS_MODERN_FEATURE),
+    ("has_use_effect_without_deps", _JS_USE_EFFECT_NO_DEPS),
+    ("has_add_listener", _JS_ADD_LISTENER),
+    ("has_remove_listener", _JS_REMOVE_LISTENER),
+    ("has_try_block", _JS_TRY_BLOCK),
+    ("has_async_call", _JS_ASYNC_CALL),
+    ("has_interactive_element", _JS_INTERACTIVE_ELEMENT),
+    ("has_a11y_attribute", _JS_A11Y_ATTRIBUTE),
+    ("has_unsafe_call", _JS_UNSAFE_CALL),
+)
+_PY_PRESENCE_CHECKS = (
+    ("has_main_guard", _PY_MAIN_GUARD),
+    ("has_type_hints", _PY_PARAM_TYPE_HINT),
+    ("has_type_hints", _PY_RETURN_TYPE_HINT),
+    ("has_response_model", _PY_RESPONSE_MODEL),
+    ("has_http_error", _PY_HTTP_ERROR),
+    ("has_try_block", _PY_TRY_BLOCK),
+    ("has_io_call", _PY_IO_CALL),
+    ("has_docstring", _PY_DOCSTRING),
+    ("has_unsafe_call", _PY_UNSAFE_CALL),
+    ("has_open_call", _PY_OPEN_CALL),
+    ("has_with_open", _PY_WITH_OPEN),
+)
+
+def _presence_expressions(pattern) -> List[str]:
+    """Return the Hyperscan expressions for a presence pattern, escaping literals."""
+    if isinstance(pattern, tuple):
+        return [re.escape(literal) for literal in pattern]
+    return [_unicode_classes(pattern.pattern)]
+
+def _compile_presence_database(checks: tuple):
+    """Compile presence checks into one Hyperscan database.
+
+    Returns the database, the checks it covers, and the signal name for each expression id.
+    """
+    if hyperscan is None:
+        return None, (), ()
+    
+    # Match on code points rather than bytes, as re does
+    flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    
+    # Leave any pattern Hyperscan rejects to the per-pattern search, such as the type hint
+    # patterns, whose spelled-out Unicode \w classes exceed its pattern size limit
+    supported = []
+    for check in checks:
+        try:
+            hyperscan.Database().compile(
+                expressions=[expression.encode() for expression in _presence_expressions(check[1])],
+                flags=flags
+            )
+        except hyperscan.error:
+            continue
+        supported.append(check)
+    
+    if not supported:
+        return None, (), ()
+    
+    expressions = []
+    expression_names = []
+    for name, pattern in supported:
+        for expression in _presence_expressions(pattern):
+            expressions.append(expression.encode())
+            expression_names.append(name)
+    
+    # Literals go to Hyperscan's multi-literal matcher, so the source is read once for all of them
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=flags
+    )
+    return database, tuple(supported), tuple(expression_names)
+
+_JS_PRESENCE_DATABASE, _JS_PRESENCE_DATABASE_CHECKS, _JS_PRESENCE_DATABASE_NAMES = _compile_presence_database(_JS_PRESENCE_CHECKS)
+_PY_PRESENCE_DATABASE, _PY_PRESENCE_DATABASE_CHECKS, _PY_PRESENCE_DATABASE_NAMES = _compile_presence_database(_PY_PRESENCE_CHECKS)
+
+def _scan_presence(code_content: str, checks: tuple, database, database_checks: tuple, database_names: tuple) -> Dict[str, bool]:
+    """Return a flag for every presence check, scanning the source once when Hyperscan is available."""
+    found = set()
+    
+    if database is not None:
+        try:
+            encoded = code_content.encode('utf-8')
+        except UnicodeEncodeError:
+            # Lone surrogates are not valid UTF-8, which the database requires; search per pattern
+            database_checks = ()
+        else:
+            def on_match(pattern_id, start, end, flags, context):
+                found.add(database_names[pattern_id])
+            
+            # Scratch space is per scan so concurrent analyses never share it
+            database.scan(encoded, match_event_handler=on_match, scratch=hyperscan.Scratch(database))
+    
+    for name, pattern in checks:
+        if (name, pattern) in database_checks or name in found:
+            continue
+        if isinstance(pattern, tuple):
+            if any(literal in code_content for literal in pattern):
+                found.add(name)
+        elif pattern.search(code_content):
+            found.add(name)
+    
+    return {name: name in found for name, _ in checks}
+
+def _collect_signals(code_content: str, lang: str) -> Dict:
+    """Run each regex check for the given language ("js" or "py") once and collect the results.
+
+    The analyzers and recommendation generators share these counts and flags, the split source
+    lines, the indentation styles and the function lengths instead of re-scanning the source.
+    """
+    lines = code_content.split('\n')
+    signals = {
+        "lines": lines,
+        "indentation_types": _indentation_types(lines),
+        "hardcoded_values": len(_HARDCODED_VALUE.findall(code_content)),
+    }
+    
+    if lang == "js":
+        # React-specific checks are skipped entirely for plain JavaScript
+        is_react = ".jsx" in code_content or "React" in code_content
+        signals.update({
+            "is_react": is_react,
+            "non_camel_vars": len(_JS_NON_CAMEL_VAR.findall(code_content)),
+            "non_pascal_components": len(_JS_NON_PASCAL_COMPONENT.findall(code_content)) if is_react else 0,
+            "non_caps_constants": len(_JS_NON_CAPS_CONST.findall(code_content)),
+            "mixed_styles": len(_JS_MIXED_STYLE.findall(code_content)),
+            "utility_functions": len(_JS_UTILITY_FUNCTION.findall(code_content)),
+        })
+        signals["function_lengths"] = _js_function_lengths(code_content, list(_JS_FUNCTION_DEF.finditer(code_content)))
+        signals.update(_scan_presence(code_content, _JS_PRESENCE_CHECKS, _JS_PRESENCE_DATABASE, _JS_PRESENCE_DATABASE_CHECKS, _JS_PRESENCE_DATABASE_NAMES))
+    else:
+        signals.update({
+            "is_fastapi": "fastapi" in code_content,
+            "non_snake_vars": len(_PY_NON_SNAKE_VAR.findall(code_content)),
+            "non_upper_constants": len(_PY_NON_UPPER_CONST.findall(code_content)),
+            "non_camel_classes": len(_PY_NON_CAMEL_CLASS.findall(code_content)),
+            "mixed_styles": len(_PY_MIXED_STYLE.findall(code_content)),
+            "utility_functions": len(_PY_UTILITY_FUNCTION.findall(code_content)),
+        })
+        # Line start offsets, so the line of each definition is a binary search
+        line_offsets = list(accumulate((len(line) + 1 for line in lines), initial=0))
+        signals["function_lengths"] = _py_function_lengths(lines, line_offsets, list(_PY_FUNCTION_DEF.finditer(code_content)))
+        signals.update(_scan_presence(code_content, _PY_PRESENCE_CHECKS, _PY_PRESENCE_DATABASE, _PY_PRESENCE_DATABASE_CHECKS, _PY_PRESENCE_DATABASE_NAMES))
+    
+    return signals
+
+class AnalysisResult(NamedTuple):
+    """Category scores and recommendations for one analyzed file."""
+    naming: int
+    modularity: int
+    comments: int
+    formatting: int
+    reusability: int
+    best_practices: int
+    recommendations: Tuple[str, ...]
+    
+    @property
+    def overall_score(self) -> int:
+        """Sum of the category scores, out of 100."""
+        return (
+            self.naming + 
+            self.modularity + 
+            self.comments + 
+            self.formatting + 
+            self.reusability + 
+            self.best_practices
+        )
+    
+    def to_dict(self) -> Dict:
+        """Return the result in the serializable shape used by the UI."""
+        return {
+            "overall_score": self.overall_score,
+            "breakdown": {
+                "naming": self.naming,
+                "modularity": self.modularity,
+                "comments": self.comments,
+                "formatting": self.formatting,
+                "reusability": self.reusability,
+                "best_practices": self.best_practices
+            },
+            "recommendations": list(self.recommendations)
+        }
+
+def analyze_javascript_code(code_content: str, detailed: bool = True) -> AnalysisResult:
     """Analyze JavaScript/JSX code and return scores and recommendations."""
+    signals = _collect_signals(code_content, "js")
+    
     # Initialize scores
-    naming_score = analyze_js_naming_conventions(code_content)
-    modularity_score = analyze_js_modularity(code_content)
-    comments_score = analyze_comments(code_content)
-    formatting_score = analyze_formatting(code_content)
-    reusability_score = analyze_js_reusability(code_content)
-    best_practices_score = analyze_js_best_practices(code_content)
-    
-    # Calculate overall score
-    overall_score = (
-        naming_score + 
-        modularity_score + 
-        comments_score + 
-        formatting_score + 
-        reusability_score + 
-        best_practices_score
-    )
+    naming_score = analyze_js_naming_conventions(code_content, signals)
+    modularity_score = analyze_js_modularity(code_content, signals)
+    comments_score = analyze_comments(code_content, signals)
+    formatting_score = analyze_formatting(code_content, signals, detailed)
+    reusability_score = analyze_js_reusability(code_content, signals, detailed)
+    best_practices_score = analyze_js_best_practices(code_content, signals)
     
     # Generate recommendations
     recommendations = generate_js_recommendations(
@@ -29,41 +436,31 @@ def analyze_javascript_code(code_content: str) -> Dict:
         comments_score,
         formatting_score,
         reusability_score,
-        best_practices_score
+        best_practices_score,
+        signals
     )
     
-    return {
-        "overall_score": overall_score,
-        "breakdown": {
-            "naming": naming_score,
-            "modularity": modularity_score,
-            "comments": comments_score,
-            "formatting": formatting_score,
-            "reusability": reusability_score,
-            "best_practices": best_practices_score
-        },
-        "recommendations": recommendations
-    }
+    return AnalysisResult(
+        naming_score,
+        modularity_score,
+        comments_score,
+        formatting_score,
+        reusability_score,
+        best_practices_score,
+        tuple(recommendations)
+    )
 
-def analyze_python_code(code_content: str) -> Dict:
+def analyze_python_code(code_content: str, detailed: bool = True) -> AnalysisResult:
     """Analyze Python code and return scores and recommendations."""
+    signals = _collect_signals(code_content, "py")
+    
     # Initialize scores
-    naming_score = analyze_py_naming_conventions(code_content)
-    modularity_score = analyze_py_modularity(code_content)
-    comments_score = analyze_comments(code_content)
-    formatting_score = analyze_formatting(code_content)
-    reusability_score = analyze_py_reusability(code_content)
-    best_practices_score = analyze_py_best_practices(code_content)
-    
-    # Calculate overall score
-    overall_score = (
-        naming_score + 
-        modularity_score + 
-        comments_score + 
-        formatting_score + 
-        reusability_score + 
-        best_practices_score
-    )
+    naming_score = analyze_py_naming_conventions(code_content, signals)
+    modularity_score = analyze_py_modularity(code_content, signals)
+    comments_score = analyze_comments(code_content, signals)
+    formatting_score = analyze_formatting(code_content, signals, detailed)
+    reusability_score = analyze_py_reusability(code_content, signals, detailed)
+    best_practices_score = analyze_py_best_practices(code_content, signals)
     
     # Generate recommendations
     recommendations = generate_py_recommendations(
@@ -73,87 +470,86 @@ def analyze_python_code(code_content: str) -> Dict:
         comments_score,
         formatting_score,
         reusability_score,
-        best_practices_score
+        best_practices_score,
+        signals
     )
     
-    return {
-        "overall_score": overall_score,
-        "breakdown": {
-            "naming": naming_score,
-            "modularity": modularity_score,
-            "comments": comments_score,
-            "formatting": formatting_score,
-            "reusability": reusability_score,
-            "best_practices": best_practices_score
-        },
-        "recommendations": recommendations
-    }
+    return AnalysisResult(
+        naming_score,
+        modularity_score,
+        comments_score,
+        formatting_score,
+        reusability_score,
+        best_practices_score,
+        tuple(recommendations)
+    )
 
 # Analysis functions for JavaScript/JSX
-def analyze_js_naming_conventions(code_content: str) -> int:
+def analyze_js_naming_conventions(code_content: str, signals: Optional[Dict] = None) -> int:
     """Analyze naming conventions in JavaScript/JSX code. Max score: 10."""
+    if signals is None:
+        signals = _collect_signals(code_content, "js")
+    
     score = 10
     
     # Check for camelCase variables (standard JS convention)
-    non_camel_case_vars = re.findall(r'(?:let|const|var)\s+([A-Z][a-zA-Z0-9]*|[a-z]+_[a-zA-Z0-9_]*)\s*=', code_content)
-    if non_camel_case_vars:
-        score -= min(3, len(non_camel_case_vars))
+    if signals["non_camel_vars"]:
+        score -= min(3, signals["non_camel_vars"])
     
     # Check for PascalCase components (React convention)
-    if ".jsx" in code_content or "React" in code_content:
-        non_pascal_case_components = re.findall(r'function\s+([a-z][a-zA-Z0-9]*)\s*\(\s*(?:props|{)', code_content)
-        if non_pascal_case_components:
-            score -= min(3, len(non_pascal_case_components))
+    if signals["is_react"]:
+        if signals["non_pascal_components"]:
+            score -= min(3, signals["non_pascal_components"])
     
     # Check for ALL_CAPS constants
-    non_caps_constants = re.findall(r'const\s+([a-z][a-zA-Z0-9]*)\s*=\s*["\'\d\[]', code_content)
-    if non_caps_constants:
-        score -= min(2, len(non_caps_constants))
+    if signals["non_caps_constants"]:
+        score -= min(2, signals["non_caps_constants"])
     
     # Check for consistent naming
-    mixed_styles = re.findall(r'(?:let|const|var)\s+([a-z][a-zA-Z0-9]*_[a-zA-Z0-9]*|[a-z][a-zA-Z0-9]*-[a-zA-Z0-9]*)', code_content)
-    if mixed_styles:
-        score -= min(2, len(mixed_styles))
+    if signals["mixed_styles"]:
+        score -= min(2, signals["mixed_styles"])
     
     return max(0, score)
 
-def analyze_js_modularity(code_content: str) -> int:
+def _js_function_lengths(code_content: str, function_matches: List) -> List:
+    """Pair each JS function match with the line count of its body, skipping empty or unclosed bodies."""
+    # Match every brace in a single pass; each function pattern ends at its opening brace
+    closing_braces = {}
+    open_braces = []
+    for brace in _JS_BRACE.finditer(code_content):
+        if brace.group() == '{':
+            open_braces.append(brace.start())
+        elif open_braces:
+            closing_braces[open_braces.pop()] = brace.start()
+    
+    function_lengths = []
+    for match in function_matches:
+        start_pos = match.end()
+        end_pos = closing_braces.get(start_pos - 1, start_pos)
+        if end_pos > start_pos:
+            function_lengths.append((match, code_content.count('\n', start_pos, end_pos) + 1))
+    
+    return function_lengths
+
+def analyze_js_modularity(code_content: str, signals: Optional[Dict] = None) -> int:
     """Analyze function length and modularity in JavaScript/JSX code. Max score: 20."""
-    score = 20
+    if signals is None:
+        signals = _collect_signals(code_content, "js")
     
-    # Find all function definitions
-    function_matches = re.finditer(r'(?:function\s+\w+\s*\(.*?\)\s*{|const\s+\w+\s*=\s*(?:\(.*?\)|.*?)\s*=>\s*{|\(\s*\)\s*=>\s*{)', code_content)
+    score = 20
     
     # Extract function bodies and count lines
     long_functions = 0
     very_long_functions = 0
     extremely_long_functions = 0
     
-    for match in function_matches:
-        start_pos = match.end()
-        # Find matching closing brace
-        brace_count = 1
-        end_pos = start_pos
-        
-        for i in range(start_pos, len(code_content)):
-            if code_content[i] == '{':
-                brace_count += 1
-            elif code_content[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    end_pos = i
-                    break
-        
-        if end_pos > start_pos:
-            function_body = code_content[start_pos:end_pos]
-            line_count = function_body.count('\n') + 1
-            
-            if line_count > 50:
-                extremely_long_functions += 1
-            elif line_count > 30:
-                very_long_functions += 1
-            elif line_count > 15:
-                long_functions += 1
+    for _, line_count in signals["function_lengths"]:
+        if line_count > 50:
+            extremely_long_functions += 1
+        elif line_count > 30:
+            very_long_functions += 1
+        elif line_count > 15:
+            long_functions += 1
     
     # Deduct points based on function length
     score -= min(10, long_functions * 2)
@@ -169,134 +565,130 @@ def analyze_js_modularity(code_content: str) -> int:
     score -= min(5, nested_callbacks)
     
     # Check for component nesting (React)
-    if ".jsx" in code_content or "React" in code_content:
+    if signals["is_react"]:
         component_nesting = code_content.count('<') - code_content.count('</')
         if component_nesting > 10:
             score -= min(5, (component_nesting - 10) // 2)
     
     return max(0, score)
 
-def analyze_js_reusability(code_content: str) -> int:
+def analyze_js_reusability(code_content: str, signals: Optional[Dict] = None, detailed: bool = True) -> int:
     """Analyze reusability and DRY principles in JavaScript/JSX code. Max score: 15."""
+    if signals is None:
+        signals = _collect_signals(code_content, "js")
+    
     score = 15
     
     # Check for repeated code blocks
-    lines = code_content.split('\n')
-    code_blocks = {}
-    
-    for i in range(len(lines)):
-        for j in range(i+3, min(i+20, len(lines))):
-            block = '\n'.join(lines[i:j])
-            if len(block) > 50:  # Only consider substantial blocks
-                if block in code_blocks:
-                    code_blocks[block] += 1
-                else:
-                    code_blocks[block] = 1
-    
-    repeated_blocks = sum(1 for count in code_blocks.values() if count > 1)
-    score -= min(10, repeated_blocks * 2)
+    if detailed:
+        repeated_blocks = _count_repeated_blocks(signals["lines"])
+        score -= min(10, repeated_blocks * 2)
+    else:
+        score -= _FAST_MODE_REPEATED_BLOCKS_PENALTY
     
     # Check for utility functions or hooks (positive)
-    utility_functions = len(re.findall(r'(?:export\s+)?(?:function|const)\s+(?:use[A-Z]|format|convert|transform|calculate|get|is|has)', code_content))
-    if utility_functions < 2:
+    if signals["utility_functions"] < 2:
         score -= 3
     
     # Check for hardcoded values that should be constants
-    hardcoded_values = len(re.findall(r'[^A-Za-z0-9_](?:\d{3,}|"[^"]{10,}"|\'[^\']{10,}\')', code_content))
-    score -= min(5, hardcoded_values)
+    score -= min(5, signals["hardcoded_values"])
     
     return max(0, score)
 
-def analyze_js_best_practices(code_content: str) -> int:
+def analyze_js_best_practices(code_content: str, signals: Optional[Dict] = None) -> int:
     """Analyze web development best practices in JavaScript/JSX code. Max score: 20."""
+    if signals is None:
+        signals = _collect_signals(code_content, "js")
+    
     score = 20
     
     # Check for use of modern JS features
-    if not re.search(r'(?:const|let|=>|async|await|\.map\(|\.filter\(|\.reduce\()', code_content):
+    if not signals["has_modern_features"]:
         score -= 5
     
     # Check for potential memory leaks in React
-    if ".jsx" in code_content or "React" in code_content:
-        if re.search(r'useEffect\([^,]+\)', code_content):
+    if signals["is_react"]:
+        if signals["has_use_effect_without_deps"]:
             score -= 3  # Missing dependency array
         
-        if re.search(r'addEventListener\(', code_content) and not re.search(r'removeEventListener\(', code_content):
+        if signals["has_add_listener"] and not signals["has_remove_listener"]:
             score -= 3  # Event listener without cleanup
     
     # Check for error handling
-    if not re.search(r'try\s*{', code_content) and re.search(r'(?:fetch|axios|\.then\()', code_content):
+    if not signals["has_try_block"] and signals["has_async_call"]:
         score -= 4  # Missing error handling for async operations
     
     # Check for accessibility issues in React
-    if ".jsx" in code_content or "React" in code_content:
-        if re.search(r'<(?:img|input|button)', code_content) and not re.search(r'(?:alt|aria-|role)', code_content):
+    if signals["is_react"]:
+        if signals["has_interactive_element"] and not signals["has_a11y_attribute"]:
             score -= 3  # Missing accessibility attributes
     
     # Check for potential security issues
-    if re.search(r'(?:innerHTML|dangerouslySetInnerHTML|eval\()', code_content):
+    if signals["has_unsafe_call"]:
         score -= 5  # Potential XSS vulnerabilities
     
     return max(0, score)
 
 # Analysis functions for Python
-def analyze_py_naming_conventions(code_content: str) -> int:
+def analyze_py_naming_conventions(code_content: str, signals: Optional[Dict] = None) -> int:
     """Analyze naming conventions in Python code. Max score: 10."""
+    if signals is None:
+        signals = _collect_signals(code_content, "py")
+    
     score = 10
     
     # Check for snake_case variables (PEP8)
-    non_snake_case_vars = re.findall(r'(?:^|\s)([a-z][a-z0-9]*[A-Z][a-zA-Z0-9]*)\s*=', code_content)
-    if non_snake_case_vars:
-        score -= min(3, len(non_snake_case_vars))
+    if signals["non_snake_vars"]:
+        score -= min(3, signals["non_snake_vars"])
     
     # Check for UPPER_CASE constants
-    non_upper_constants = re.findall(r'(?:^|\s)([a-z][a-zA-Z0-9_]*)\s*=\s*(?:["\'0-9\[]|True|False|None)', code_content)
-    if non_upper_constants and re.search(r'if\s+__name__\s*==\s*["\']__main__["\']', code_content):
-        score -= min(2, len(non_upper_constants))
+    if signals["non_upper_constants"] and signals["has_main_guard"]:
+        score -= min(2, signals["non_upper_constants"])
     
     # Check for CamelCase classes (PEP8)
-    non_camel_case_classes = re.findall(r'class\s+([a-z][a-zA-Z0-9_]*)', code_content)
-    if non_camel_case_classes:
-        score -= min(3, len(non_camel_case_classes))
+    if signals["non_camel_classes"]:
+        score -= min(3, signals["non_camel_classes"])
     
     # Check for consistent naming
-    mixed_styles = re.findall(r'(?:^|\s)([a-z][a-zA-Z0-9]*[A-Z][a-zA-Z0-9]*_[a-zA-Z0-9_]*)', code_content)
-    if mixed_styles:
-        score -= min(2, len(mixed_styles))
+    if signals["mixed_styles"]:
+        score -= min(2, signals["mixed_styles"])
     
     return max(0, score)
 
-def analyze_py_modularity(code_content: str) -> int:
+def _py_function_lengths(lines: List[str], line_offsets: List[int], function_matches: List) -> List:
+    """Pair each Python function match with its length in lines, ending at the next unindented line."""
+    if not function_matches:
+        return []
+    
+    # A function ends at the first later line that is unindented and is not blank or a comment.
+    # Find those lines in one pass so each function's end is a binary search, not a line walk.
+    unindented_lines = [
+        index for index, line in enumerate(lines)
+        if line and not line[0].isspace() and line[0] != '#'
+    ]
+    
+    function_lengths = []
+    for match in function_matches:
+        start_line = bisect_right(line_offsets, match.start()) - 1
+        next_unindented = bisect_right(unindented_lines, start_line)
+        end_line = unindented_lines[next_unindented] if next_unindented < len(unindented_lines) else len(lines)
+        function_lengths.append((match, end_line - start_line))
+    
+    return function_lengths
+
+def analyze_py_modularity(code_content: str, signals: Optional[Dict] = None) -> int:
     """Analyze function length and modularity in Python code. Max score: 20."""
-    score = 20
+    if signals is None:
+        signals = _collect_signals(code_content, "py")
     
-    # Find all function and method definitions
-    function_matches = re.finditer(r'(?:^|\s)def\s+[a-zA-Z0-9_]+\s*\(', code_content, re.MULTILINE)
+    score = 20
     
     # Extract function bodies and count lines
     long_functions = 0
     very_long_functions = 0
     extremely_long_functions = 0
     
-    for match in function_matches:
-        start_line = code_content[:match.start()].count('\n')
-        lines = code_content.split('\n')
-        
-        # Find the end of the function by indentation
-        end_line = start_line + 1
-        while end_line < len(lines):
-            # Skip empty lines or comments
-            if not lines[end_line].strip() or lines[end_line].strip().startswith('#'):
-                end_line += 1
-                continue
-                
-            # Check if this line has less indentation than the function definition
-            if not re.match(r'\s+', lines[end_line]):
-                break
-                
-            end_line += 1
-        
-        function_length = end_line - start_line
-        
+    for _, function_length in signals["function_lengths"]:
         if function_length > 50:
             extremely_long_functions += 1
         elif function_length > 30:
@@ -311,8 +703,7 @@ def analyze_py_modularity(code_content: str) -> int:
     
     # Check for nested loops and conditionals
     nested_depth = 0
-    lines = code_content.split('\n')
-    for line in lines:
+    for line in signals["lines"]:
         indent_level = len(line) - len(line.lstrip())
         if indent_level > nested_depth:
             nested_depth = indent_level
@@ -322,86 +713,95 @@ def analyze_py_modularity(code_content: str) -> int:
     
     return max(0, score)
 
-def analyze_py_reusability(code_content: str) -> int:
+def analyze_py_reusability(code_content: str, signals: Optional[Dict] = None, detailed: bool = True) -> int:
     """Analyze reusability and DRY principles in Python code. Max score: 15."""
+    if signals is None:
+        signals = _collect_signals(code_content, "py")
+    
     score = 15
     
     # Check for repeated code blocks
-    lines = code_content.split('\n')
-    code_blocks = {}
-    
-    for i in range(len(lines)):
-        for j in range(i+3, min(i+20, len(lines))):
-            block = '\n'.join(lines[i:j])
-            if len(block) > 50:  # Only consider substantial blocks
-                if block in code_blocks:
-                    code_blocks[block] += 1
-                else:
-                    code_blocks[block] = 1
-    
-    repeated_blocks = sum(1 for count in code_blocks.values() if count > 1)
-    score -= min(10, repeated_blocks * 2)
+    if detailed:
+        repeated_blocks = _count_repeated_blocks(signals["lines"])
+        score -= min(10, repeated_blocks * 2)
+    else:
+        score -= _FAST_MODE_REPEATED_BLOCKS_PENALTY
     
     # Check for utility functions (positive)
-    utility_functions = len(re.findall(r'def\s+(?:format|convert|transform|calculate|get|is|has|validate)', code_content))
-    if utility_functions < 2:
+    if signals["utility_functions"] < 2:
         score -= 3
     
     # Check for hardcoded values that should be constants
-    hardcoded_values = len(re.findall(r'[^A-Za-z0-9_](?:\d{3,}|"[^"]{10,}"|\'[^\']{10,}\')', code_content))
-    score -= min(5, hardcoded_values)
+    score -= min(5, signals["hardcoded_values"])
     
     return max(0, score)
 
-def analyze_py_best_practices(code_content: str) -> int:
+def analyze_py_best_practices(code_content: str, signals: Optional[Dict] = None) -> int:
     """Analyze web development best practices in Python code. Max score: 20."""
+    if signals is None:
+        signals = _collect_signals(code_content, "py")
+    
     score = 20
     
     # Check for FastAPI best practices
-    if "fastapi" in code_content:
+    if signals["is_fastapi"]:
         # Check for type hints
-        if not re.search(r'def\s+\w+\([^)]*:\s*\w+', code_content) and not re.search(r'def\s+\w+\([^)]*\)\s*->\s*\w+', code_content):
+        if not signals["has_type_hints"]:
             score -= 4  # Missing type hints
         
         # Check for proper response models
-        if not re.search(r'(?:response_model|BaseModel)', code_content):
+        if not signals["has_response_model"]:
             score -= 3  # Missing response models
         
         # Check for proper error handling
-        if not re.search(r'(?:HTTPException|status\.)', code_content):
+        if not signals["has_http_error"]:
             score -= 3  # Missing error handling
     
     # Check for error handling
-    if not re.search(r'try\s*:', code_content) and re.search(r'(?:requests\.|open\(|json\.)', code_content):
+    if not signals["has_try_block"] and signals["has_io_call"]:
         score -= 4  # Missing error handling for I/O operations
     
     # Check for docstrings
-    if not re.search(r'"""', code_content):
+    if not signals["has_docstring"]:
         score -= 3  # Missing docstrings
     
     # Check for potential security issues
-    if re.search(r'(?:eval\(|exec\(|subprocess\.)', code_content):
+    if signals["has_unsafe_call"]:
         score -= 5  # Potential security vulnerabilities
     
     # Check for use of context managers
-    if re.search(r'open\(', code_content) and not re.search(r'with\s+open\(', code_content):
+    if signals["has_open_call"] and not signals["has_with_open"]:
         score -= 3  # Not using context managers for file operations
     
     return max(0, score)
 
 # Common analysis functions
-def analyze_comments(code_content: str) -> int:
+def _count_repeated_blocks(lines: List[str]) -> int:
+    """Count distinct blocks of 3-19 consecutive lines (over 50 characters) that occur more than once."""
+    # Identify each line by the index of its first occurrence so blocks can be compared
+    # as tuples of ints instead of joined strings. Blocks never include the last line.
+    line_ids = {}
+    ids = list(map(line_ids.setdefault, lines, count()))[:-1]
+    # cum_len[i] is the total length of lines[:i], so a block's joined length is O(1)
+    cum_len = list(accumulate(map(len, lines), initial=0))
+    
+    block_counts = Counter()
+    for width in range(3, 20):
+        # Slide a window of `width` line ids over the file, keeping only substantial blocks
+        windows = zip(*(ids[k:] for k in range(width)))
+        substantial = map((51 - width).__lt__, map(sub, cum_len[width:], cum_len))
+        block_counts.update(compress(windows, substantial))
+    
+    return sum(1 for occurrences in block_counts.values() if occurrences > 1)
+
+def analyze_comments(code_content: str, signals: Optional[Dict] = None) -> int:
     """Analyze comments and documentation. Max score: 20."""
     score = 20
-    lines = code_content.split('\n')
+    lines = code_content.split('\n') if signals is None else signals["lines"]
     total_lines = len(lines)
     
     # Count comment lines
-    comment_lines = 0
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith('//') or stripped.startswith('#') or stripped.startswith('/*') or stripped.startswith('*'):
-            comment_lines += 1
+    comment_lines = sum(1 for line in lines if line.lstrip().startswith(_COMMENT_PREFIXES))
     
     # Calculate comment ratio
     comment_ratio = comment_lines / total_lines if total_lines > 0 else 0
@@ -420,8 +820,8 @@ def analyze_comments(code_content: str) -> int:
     if '.py' in code_content:
         # Check for docstrings in Python
         docstring_count = code_content.count('"""') // 2  # Each docstring has opening and closing quotes
-        function_count = len(re.findall(r'def\s+', code_content))
-        class_count = len(re.findall(r'class\s+', code_content))
+        function_count = len(_PY_DEF_KEYWORD.findall(code_content))
+        class_count = len(_PY_CLASS_KEYWORD.findall(code_content))
         
         if function_count + class_count > 0:
             docstring_ratio = docstring_count / (function_count + class_count)
@@ -431,8 +831,8 @@ def analyze_comments(code_content: str) -> int:
                 score -= 5   # Most but not all functions/classes have docstrings
     else:
         # Check for JSDoc in JavaScript
-        jsdoc_count = len(re.findall(r'/\*\*[\s\S]*?\*/', code_content))
-        function_count = len(re.findall(r'function\s+|const\s+\w+\s*=\s*(?:function|\(.*?\)\s*=>)', code_content))
+        jsdoc_count = len(_JSDOC.findall(code_content))
+        function_count = len(_JS_FUNCTION_KEYWORD.findall(code_content))
         
         if function_count > 0:
             jsdoc_ratio = jsdoc_count / function_count
@@ -443,12 +843,8 @@ def analyze_comments(code_content: str) -> int:
     
     return max(0, score)
 
-def analyze_formatting(code_content: str) -> int:
-    """Analyze code formatting and indentation. Max score: 15."""
-    score = 15
-    lines = code_content.split('\n')
-    
-    # Check for consistent indentation
+def _indentation_types(lines: List[str]) -> set:
+    """Return the indentation styles ('tab', '2spaces', '4spaces', 'other') used by the indented lines."""
     indentation_types = set()
     for line in lines:
         if line.strip() and line[0].isspace():
@@ -465,6 +861,19 @@ def analyze_formatting(code_content: str) -> int:
                 else:
                     indentation_types.add('other')
     
+    return indentation_types
+
+def analyze_formatting(code_content: str, signals: Optional[Dict] = None, detailed: bool = True) -> int:
+    """Analyze code formatting and indentation. Max score: 15."""
+    score = 15
+    if signals is None:
+        lines = code_content.split('\n')
+        indentation_types = _indentation_types(lines)
+    else:
+        lines = signals["lines"]
+        indentation_types = signals["indentation_types"]
+    
+    # Check for consistent indentation
     # Deduct points for mixed indentation
     if len(indentation_types) > 1:
         score -= 8  # Mixed indentation styles
@@ -474,14 +883,19 @@ def analyze_formatting(code_content: str) -> int:
     score -= min(5, long_lines // 3)
     
     # Check for consistent spacing around operators
-    inconsistent_spacing = 0
-    for pattern in [r'=', r'\+', r'-', r'\*', r'/', r'==', r'!=', r'>=', r'<=']:
-        no_space_count = len(re.findall(r'[a-zA-Z0-9]' + pattern + r'[a-zA-Z0-9]', code_content))
-        one_side_space_count = len(re.findall(r'[a-zA-Z0-9]\s+' + pattern + r'[a-zA-Z0-9]|[a-zA-Z0-9]' + pattern + r'\s+[a-zA-Z0-9]', code_content))
-        if no_space_count > 0 and one_side_space_count > 0:
-            inconsistent_spacing += 1
-    
-    score -= min(5, inconsistent_spacing)
+    if detailed:
+        no_space_operators = set()
+        one_side_space_operators = set()
+        for before, operator, after in _OPERATOR_SPACING.findall(code_content):
+            if not before and not after:
+                no_space_operators.add(operator)
+            elif not before or not after:
+                one_side_space_operators.add(operator)
+        inconsistent_spacing = len(no_space_operators & one_side_space_operators)
+        
+        score -= min(5, inconsistent_spacing)
+    else:
+        score -= _FAST_MODE_SPACING_PENALTY
     
     # Check for trailing whitespace
     trailing_whitespace = sum(1 for line in lines if line.rstrip() != line)
@@ -490,49 +904,46 @@ def analyze_formatting(code_content: str) -> int:
     return max(0, score)
 
 # Recommendation generators
+
+# Fallbacks used when fewer than 3 specific recommendations apply
+_JS_GENERAL_RECOMMENDATIONS = (
+    "Consider using ESLint to enforce code style and catch potential issues.",
+    "Implement unit tests to ensure code reliability.",
+    "Use TypeScript for better type safety and developer experience."
+)
+_PY_GENERAL_RECOMMENDATIONS = (
+    "Consider using a linter like flake8 or pylint to enforce code style and catch potential issues.",
+    "Implement unit tests to ensure code reliability.",
+    "Use virtual environments to manage dependencies."
+)
+
 def generate_js_recommendations(code_content: str, naming_score: int, modularity_score: int, 
                                comments_score: int, formatting_score: int, reusability_score: int, 
-                               best_practices_score: int) -> List[str]:
+                               best_practices_score: int, signals: Optional[Dict] = None) -> List[str]:
     """Generate recommendations for JavaScript/JSX code."""
+    if signals is None:
+        signals = _collect_signals(code_content, "js")
+    
     recommendations = []
     
     # Naming conventions recommendations
     if naming_score < 8:
-        if re.search(r'(?:let|const|var)\s+([A-Z][a-zA-Z0-9]*|[a-z]+_[a-zA-Z0-9_]*)\s*=', code_content):
+        if signals["non_camel_vars"]:
             recommendations.append("Use camelCase for variable names (e.g., 'totalAmount' instead of 'Total_Amount' or 'TotalAmount').")
         
-        if ".jsx" in code_content or "React" in code_content:
-            if re.search(r'function\s+([a-z][a-zA-Z0-9]*)\s*\(\s*(?:props|{)', code_content):
+        if signals["is_react"]:
+            if signals["non_pascal_components"]:
                 recommendations.append("Use PascalCase for React component names (e.g., 'UserProfile' instead of 'userProfile').")
     
     # Modularity recommendations
     if modularity_score < 15:
-        function_matches = re.finditer(r'(?:function\s+\w+\s*\(.*?\)\s*{|const\s+\w+\s*=\s*(?:\(.*?\)|.*?)\s*=>\s*{|\(\s*\)\s*=>\s*{)', code_content)
-        for match in function_matches:
-            start_pos = match.end()
-            # Find matching closing brace
-            brace_count = 1
-            end_pos = start_pos
-            
-            for i in range(start_pos, len(code_content)):
-                if code_content[i] == '{':
-                    brace_count += 1
-                elif code_content[i] == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        end_pos = i
-                        break
-            
-            if end_pos > start_pos:
-                function_body = code_content[start_pos:end_pos]
-                line_count = function_body.count('\n') + 1
-                
-                if line_count > 30:
-                    function_name = re.search(r'(?:function\s+(\w+)|const\s+(\w+)\s*=)', code_content[match.start():match.end()])
-                    if function_name:
-                        name = function_name.group(1) or function_name.group(2)
-                        recommendations.append(f"Function '{name}' is too long ({line_count} lines). Consider breaking it into smaller functions.")
-                        break
+        for match, line_count in signals["function_lengths"]:
+            if line_count > 30:
+                function_name = _JS_FUNCTION_NAME.search(code_content[match.start():match.end()])
+                if function_name:
+                    name = function_name.group(1) or function_name.group(2)
+                    recommendations.append(f"Function '{name}' is too long ({line_count} lines). Consider breaking it into smaller functions.")
+                    break
     
     # Comments recommendations
     if comments_score < 15:
@@ -544,136 +955,119 @@ def generate_js_recommendations(code_content: str, naming_score: int, modularity
     
     # Reusability recommendations
     if reusability_score < 10:
-        if len(re.findall(r'[^A-Za-z0-9_](?:\d{3,}|"[^"]{10,}"|\'[^\']{10,}\')', code_content)) > 2:
+        if signals["hardcoded_values"] > 2:
             recommendations.append("Extract magic numbers and strings into named constants for better maintainability.")
     
     # Best practices recommendations
     if best_practices_score < 15:
-        if ".jsx" in code_content or "React" in code_content:
-            if re.search(r'useEffect\([^,]+\)', code_content):
+        if signals["is_react"]:
+            if signals["has_use_effect_without_deps"]:
                 recommendations.append("Add dependency arrays to useEffect hooks to prevent unnecessary re-renders.")
             
-            if re.search(r'<(?:img|input|button)', code_content) and not re.search(r'(?:alt|aria-|role)', code_content):
+            if signals["has_interactive_element"] and not signals["has_a11y_attribute"]:
                 recommendations.append("Add accessibility attributes (alt, aria-* attributes, role) to improve accessibility.")
         
-        if re.search(r'(?:innerHTML|dangerouslySetInnerHTML|eval\()', code_content):
+        if signals["has_unsafe_call"]:
             recommendations.append("Avoid using innerHTML, dangerouslySetInnerHTML, or eval() to prevent security vulnerabilities.")
     
     # Limit to 3-5 recommendations
     if len(recommendations) < 3:
         # Add general recommendations if we don't have enough specific ones
-        general_recommendations = [
-            "Consider using ESLint to enforce code style and catch potential issues.",
-            "Implement unit tests to ensure code reliability.",
-            "Use TypeScript for better type safety and developer experience."
-        ]
-        recommendations.extend(general_recommendations[:3 - len(recommendations)])
+        recommendations.extend(_JS_GENERAL_RECOMMENDATIONS[:3 - len(recommendations)])
     
     return recommendations[:5]
 
 def generate_py_recommendations(code_content: str, naming_score: int, modularity_score: int, 
                                comments_score: int, formatting_score: int, reusability_score: int, 
-                               best_practices_score: int) -> List[str]:
+                               best_practices_score: int, signals: Optional[Dict] = None) -> List[str]:
     """Generate recommendations for Python code."""
+    if signals is None:
+        signals = _collect_signals(code_content, "py")
+    
     recommendations = []
     
     # Naming conventions recommendations
     if naming_score < 8:
-        if re.search(r'(?:^|\s)([a-z][a-z0-9]*[A-Z][a-zA-Z0-9]*)\s*=', code_content):
+        if signals["non_snake_vars"]:
             recommendations.append("Use snake_case for variable and function names (e.g., 'total_amount' instead of 'totalAmount').")
         
-        if re.search(r'class\s+([a-z][a-zA-Z0-9_]*)', code_content):
+        if signals["non_camel_classes"]:
             recommendations.append("Use PascalCase for class names (e.g., 'UserProfile' instead of 'user_profile').")
     
     # Modularity recommendations
     if modularity_score < 15:
-        function_matches = re.finditer(r'(?:^|\s)def\s+([a-zA-Z0-9_]+)\s*\(', code_content, re.MULTILINE)
-        for match in function_matches:
-            function_name = match.group(1)
-            start_line = code_content[:match.start()].count('\n')
-            lines = code_content.split('\n')
-            
-            # Find the end of the function by indentation
-            end_line = start_line + 1
-            while end_line < len(lines):
-                # Skip empty lines or comments
-                if not lines[end_line].strip() or lines[end_line].strip().startswith('#'):
-                    end_line += 1
-                    continue
-                    
-                # Check if this line has less indentation than the function definition
-                if not re.match(r'\s+', lines[end_line]):
-                    break
-                    
-                end_line += 1
-            
-            function_length = end_line - start_line
-            
+        for match, function_length in signals["function_lengths"]:
             if function_length > 30:
-                recommendations.append(f"Function '{function_name}' is too long ({function_length} lines). Consider breaking it into smaller functions.")
+                recommendations.append(f"Function '{match.group(1)}' is too long ({function_length} lines). Consider breaking it into smaller functions.")
                 break
     
     # Comments recommendations
     if comments_score < 15:
-        if not re.search(r'"""', code_content):
+        if not signals["has_docstring"]:
             recommendations.append("Add docstrings to functions and classes to document their purpose and parameters.")
         else:
             recommendations.append("Add more inline comments to explain complex logic and implementation details.")
     
     # Formatting recommendations
     if formatting_score < 10:
-        indentation_types = set()
-        lines = code_content.split('\n')
-        for line in lines:
-            if line.strip() and line[0].isspace():
-                if line[0] == '\t':
-                    indentation_types.add('tab')
-                else:
-                    spaces = len(line) - len(line.lstrip(' '))
-                    if spaces % 2 == 0 and spaces % 4 != 0:
-                        indentation_types.add('2spaces')
-                    elif spaces % 4 == 0:
-                        indentation_types.add('4spaces')
-                    else:
-                        indentation_types.add('other')
-        
-        if len(indentation_types) > 1:
+        if len(signals["indentation_types"]) > 1:
             recommendations.append("Use consistent indentation (PEP 8 recommends 4 spaces per indentation level).")
     
     # Reusability recommendations
     if reusability_score < 10:
-        if len(re.findall(r'[^A-Za-z0-9_](?:\d{3,}|"[^"]{10,}"|\'[^\']{10,}\')', code_content)) > 2:
+        if signals["hardcoded_values"] > 2:
             recommendations.append("Extract magic numbers and strings into named constants for better maintainability.")
     
     # Best practices recommendations
     if best_practices_score < 15:
-        if "fastapi" in code_content:
-            if not re.search(r'def\s+\w+\([^)]*:\s*\w+', code_content) and not re.search(r'def\s+\w+\([^)]*\)\s*->\s*\w+', code_content):
+        if signals["is_fastapi"]:
+            if not signals["has_type_hints"]:
                 recommendations.append("Add type hints to function parameters and return values for better code clarity.")
             
-            if not re.search(r'(?:HTTPException|status\.)', code_content):
+            if not signals["has_http_error"]:
                 recommendations.append("Implement proper error handling with HTTPException and status codes.")
         
-        if re.search(r'open\(', code_content) and not re.search(r'with\s+open\(', code_content):
+        if signals["has_open_call"] and not signals["has_with_open"]:
             recommendations.append("Use context managers (with statement) for file operations to ensure proper resource cleanup.")
     
     # Limit to 3-5 recommendations
     if len(recommendations) < 3:
         # Add general recommendations if we don't have enough specific ones
-        general_recommendations = [
-            "Consider using a linter like flake8 or pylint to enforce code style and catch potential issues.",
-            "Implement unit tests to ensure code reliability.",
-            "Use virtual environments to manage dependencies."
-        ]
-        recommendations.extend(general_recommendations[:3 - len(recommendations)])
+        recommendations.extend(_PY_GENERAL_RECOMMENDATIONS[:3 - len(recommendations)])
     
     return recommendations[:5]
 
-def analyze_code(code_content: str, file_extension: str) -> Dict:
-    """Analyze code based on file extension."""
+def _profiled(analyze, code_content: str, detailed: bool) -> AnalysisResult:
+    """Run an analysis under cProfile and print the hottest calls to stderr."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(analyze, code_content, detailed)
+    pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+    return result
+
+def analyze_code(code_content: str, file_extension: str, detailed: bool = _DETAILED) -> AnalysisResult:
+    """Analyze code based on file extension.
+
+    With detailed=False the most expensive checks are skipped and scored with fixed penalties.
+    """
     if file_extension in [".js", ".jsx"]:
-        return analyze_javascript_code(code_content)
+        analyze = analyze_javascript_code
     elif file_extension == ".py":
-        return analyze_python_code(code_content)
+        analyze = analyze_python_code
     else:
         raise ValueError(f"Unsupported file extension: {file_extension}")
+    
+    # Analysis is deterministic, so repeated uploads of the same file reuse the earlier result
+    cache_key = (hashlib.blake2b(code_content.encode('utf-8', 'surrogatepass'), digest_size=16).digest(), file_extension, detailed)
+    with _RESULT_CACHE_LOCK:
+        result = _RESULT_CACHE.get(cache_key)
+        if result is not None:
+            _RESULT_CACHE.move_to_end(cache_key)
+            return result
+    
+    result = _profiled(analyze, code_content, detailed) if _PROFILE else analyze(code_content, detailed)
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[cache_key] = result
+        if len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+    
+    return result
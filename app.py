@@ -1,15 +1,27 @@
 import os
-import gradio as gr
-from ui import create_ui
 
-# Create example files directory if it doesn't exist
-os.makedirs("examples", exist_ok=True)
+# Keep cached example results next to the app instead of in the working directory, so a
+# restart finds the examples it already analyzed. Must be set before gradio is imported.
+os.environ.setdefault(
+    "GRADIO_EXAMPLES_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "gradio_cached_examples")
+)
 
-# Create the Gradio UI
-app = create_ui()
+from ui import create_ui, warm_up_analysis_pool
+
+# Analysis workers run this file again as __mp_main__; they only need the analyzer, not the UI
+if __name__ != "__mp_main__":
+    # Create example files directory if it doesn't exist
+    os.makedirs("examples", exist_ok=True)
+    
+    # Create the Gradio UI
+    app = create_ui()
 
 # Launch the app with Hugging Face Spaces compatible settings
 if __name__ == "__main__":
+    # Start the analysis workers before the server threads do
+    warm_up_analysis_pool()
+    
     app.launch(
         server_name="0.0.0.0",  # Required for Hugging Face Spaces
         server_port=7860,       # Default port for Hugging Face Spaces
@@ -1,47 +1,142 @@
-import gradio as gr
+import hashlib
+import multiprocessing
 import os
-import tempfile
-from analyzer import analyze_code
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# gradio and the analyzer are imported where they are used, so process_file can be
+# imported without loading the UI stack
+
+# Analysis is CPU-bound, so it runs in worker processes to let concurrent uploads use every core.
+# Size the pool from the CPUs this process may run on, not the host's, and cap it because a
+# CPU quota in a container is not visible here and every worker is started on the first submit.
+_MAX_ANALYSIS_WORKERS = 8
+_ANALYSIS_WORKERS = min(
+    _MAX_ANALYSIS_WORKERS,
+    len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+)
+
+# Workers come from a fork server rather than the platform default. Forking the server process
+# from a Gradio handler thread is unsafe, and spawned workers would each import the whole app.
+# The server imports the analyzer once, so each worker starts with the patterns compiled.
+if "forkserver" in multiprocessing.get_all_start_methods():
+    _ANALYSIS_CONTEXT = multiprocessing.get_context("forkserver")
+    _ANALYSIS_CONTEXT.set_forkserver_preload(["analyzer"])
+else:
+    _ANALYSIS_CONTEXT = multiprocessing.get_context("spawn")
+
+# Started by the first analysis, since workers import this module again when they run the main script
+_ANALYSIS_POOL = None
+_ANALYSIS_POOL_LOCK = threading.Lock()
+
+# Results returned by the workers, keyed like the analyzer's own cache by (blake2b digest of the
+# source, file extension) so uploaded text is not kept alive. Handlers run on several threads.
+_RESULT_CACHE = OrderedDict()
+_RESULT_CACHE_SIZE = 256
+_RESULT_CACHE_LOCK = threading.Lock()
+
+_SUPPORTED_EXTENSIONS = frozenset({".js", ".jsx", ".py"})
+
+# Heading plus the first bullet marker; the remaining items are joined with "\n- "
+_REC_PREFIX = "### Recommendations:\n- "
+
+def warm_up_analysis_pool():
+    """Start the analysis worker processes before the first upload arrives."""
+    _run_analysis("", ".py")
+
+def _replace_analysis_pool(pool):
+    """Swap in a new worker pool for a broken or unstarted one, unless another thread already has."""
+    global _ANALYSIS_POOL
+    with _ANALYSIS_POOL_LOCK:
+        if _ANALYSIS_POOL is pool:
+            _ANALYSIS_POOL = ProcessPoolExecutor(max_workers=_ANALYSIS_WORKERS, mp_context=_ANALYSIS_CONTEXT)
+            if pool is not None:
+                pool.shutdown(wait=False)
+        return _ANALYSIS_POOL
+
+def _run_analysis(content, file_extension):
+    """Analyze code in a worker process, replacing the pool if a worker has died."""
+    from analyzer import analyze_code
+    
+    # A worker that exits abruptly (for example, killed for memory) takes the pool with it
+    pool = _ANALYSIS_POOL or _replace_analysis_pool(None)
+    try:
+        future = pool.submit(analyze_code, content, file_extension)
+    except BrokenProcessPool:
+        # The pool broke before this input reached it, so run it on a new one
+        pool = _replace_analysis_pool(pool)
+        future = pool.submit(analyze_code, content, file_extension)
+    
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        # This input may be what killed the worker, so it is not retried
+        _replace_analysis_pool(pool)
+        raise
+
+def _analyze_cached(content, file_extension):
+    """Analyze code in a worker process, reusing the result for content seen before.
+
+    Each worker keeps its own result cache, so repeats are caught here before dispatching.
+    """
+    cache_key = (hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest(), file_extension)
+    with _RESULT_CACHE_LOCK:
+        result = _RESULT_CACHE.get(cache_key)
+        if result is not None:
+            _RESULT_CACHE.move_to_end(cache_key)
+            return result
+    
+    result = _run_analysis(content, file_extension)
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[cache_key] = result
+        if len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+    
+    return result
 
 def process_file(file_path):
     """Process uploaded file and return analysis results."""
     # Get file extension
     file_extension = os.path.splitext(file_path)[1].lower()
-    
-    # Check if file extension is supported
-    if file_extension not in [".js", ".jsx", ".py"]:
+    if file_extension not in _SUPPORTED_EXTENSIONS:
         return {
             "error": f"Unsupported file type: {file_extension}. Please upload a .js, .jsx, or .py file."
         }
     
     # Read file content
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            content = f.read().decode('utf-8')
+        # Normalize line endings as text mode would
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
         
         # Analyze code
-        result = analyze_code(content, file_extension)
+        result = _analyze_cached(content, file_extension)
         
         # Format the results for display
-        overall_score = result["overall_score"]
-        breakdown = result["breakdown"]
-        recommendations = result["recommendations"]
-        
-        # Create formatted output
-        output = {
-            "overall_score": overall_score,
-            "breakdown": breakdown,
-            "recommendations": recommendations
-        }
-        
-        return output
+        return result.to_dict()
     except Exception as e:
         return {
             "error": f"Error analyzing code: {str(e)}"
         }
 
+# The Blocks app, built on the first create_ui call
+_APP = None
+
 def create_ui():
+    """Return the Gradio UI, building it on the first call."""
+    global _APP
+    if _APP is None:
+        _APP = _build_ui()
+    return _APP
+
+def _build_ui():
     """Create and configure the Gradio UI."""
+    import gradio as gr
+    
     with gr.Blocks(title="Code Quality Analyzer", theme=gr.themes.Soft()) as app:
         gr.Markdown(
             """
@@ -64,7 +159,7 @@ def create_ui():
             with gr.Column(scale=1):
                 file_input = gr.File(
                     label="Upload Code File",
-                    file_types=[".js", ".jsx", ".py"],
+                    file_types=sorted(_SUPPORTED_EXTENSIONS),
                     type="filepath"
                 )
                 analyze_btn = gr.Button("Analyze Code", variant="primary")
@@ -89,92 +184,102 @@ def create_ui():
                 recommendations = gr.Markdown(label="Recommendations")
                 error_output = gr.Markdown(visible=False)
         
-        # Set up event handlers
+        # The last analysis as (path, mtime_ns, result), so re-clicking an unchanged upload is free.
+        # Replaced as a whole tuple so concurrent handlers never see a mixed entry.
+        last_analysis = (None, None, None)
+        
+        # Set up event handlers. Results are returned positionally, in the order of the outputs list.
         def on_analyze(file):
+            nonlocal last_analysis
+            
             if file is None:
-                return {
-                    error_output: gr.update(value="Please upload a file to analyze.", visible=True),
-                    overall_score: None,
-                    naming_score: None,
-                    modularity_score: None,
-                    comments_score: None,
-                    formatting_score: None,
-                    reusability_score: None,
-                    best_practices_score: None,
-                    recommendations: ""
-                }
+                return (
+                    gr.update(value="Please upload a file to analyze.", visible=True),
+                    None, None, None, None, None, None, None,
+                    ""
+                )
+            
+            try:
+                mtime_ns = os.stat(file).st_mtime_ns
+            except OSError:
+                mtime_ns = None
             
-            result = process_file(file)
+            last_path, last_mtime_ns, last_result = last_analysis
+            if mtime_ns is not None and last_path == file and last_mtime_ns == mtime_ns:
+                result = last_result
+            else:
+                result = process_file(file)
+                # Errors may be transient (such as a worker dying), so only successes are kept
+                if mtime_ns is not None and "error" not in result:
+                    last_analysis = (file, mtime_ns, result)
             
             if "error" in result:
-                return {
-                    error_output: gr.update(value=f"**Error:** {result['error']}", visible=True),
-                    overall_score: None,
-                    naming_score: None,
-                    modularity_score: None,
-                    comments_score: None,
-                    formatting_score: None,
-                    reusability_score: None,
-                    best_practices_score: None,
-                    recommendations: ""
-                }
+                return (
+                    gr.update(value=f"**Error:** {result['error']}", visible=True),
+                    None, None, None, None, None, None, None,
+                    ""
+                )
             
             # Format recommendations as markdown list
-            recommendations_md = "### Recommendations:\n" + "\n".join([f"- {rec}" for rec in result["recommendations"]])
+            recommendations_md = _REC_PREFIX + ("\n- ".join(result["recommendations"]) or "(none)")
             
-            return {
-                error_output: gr.update(visible=False),
-                overall_score: result["overall_score"],
-                naming_score: result["breakdown"]["naming"],
-                modularity_score: result["breakdown"]["modularity"],
-                comments_score: result["breakdown"]["comments"],
-                formatting_score: result["breakdown"]["formatting"],
-                reusability_score: result["breakdown"]["reusability"],
-                best_practices_score: result["breakdown"]["best_practices"],
-                recommendations: recommendations_md
-            }
+            breakdown = result["breakdown"]
+            return (
+                gr.update(visible=False),
+                result["overall_score"],
+                breakdown["naming"],
+                breakdown["modularity"],
+                breakdown["comments"],
+                breakdown["formatting"],
+                breakdown["reusability"],
+                breakdown["best_practices"],
+                recommendations_md
+            )
+        
+        # Order matches the tuples returned by on_analyze
+        analysis_outputs = [
+            error_output,
+            overall_score,
+            naming_score,
+            modularity_score,
+            comments_score,
+            formatting_score,
+            reusability_score,
+            best_practices_score,
+            recommendations
+        ]
         
         analyze_btn.click(
             fn=on_analyze,
             inputs=[file_input],
-            outputs=[
-                error_output,
-                overall_score,
-                naming_score,
-                modularity_score,
-                comments_score,
-                formatting_score,
-                reusability_score,
-                best_practices_score,
-                recommendations
-            ]
+            outputs=analysis_outputs,
+            # Gradio runs one call per event by default; allow one per analysis worker
+            concurrency_limit=_ANALYSIS_WORKERS
         )
         
         # Add examples
         examples_dir = os.path.join(os.path.dirname(__file__), "examples")
         example_files = []
-        if os.path.exists(examples_dir):
-            for filename in os.listdir(examples_dir):
-                if filename.endswith((".js", ".jsx", ".py")):
-                    example_files.append(os.path.join(examples_dir, filename))
+        if os.path.isdir(examples_dir):
+            # scandir reports the entry type from the directory listing, without a stat per file
+            with os.scandir(examples_dir) as entries:
+                example_files = [
+                    entry.path for entry in entries
+                    if entry.is_file() and os.path.splitext(entry.name)[1] in _SUPPORTED_EXTENSIONS
+                ]
         
         if example_files:
             gr.Examples(
                 examples=example_files,
                 inputs=file_input,
-                outputs=[
-                    error_output,
-                    overall_score,
-                    naming_score,
-                    modularity_score,
-                    comments_score,
-                    formatting_score,
-                    reusability_score,
-                    best_practices_score,
-                    recommendations
-                ],
+                outputs=analysis_outputs,
                 fn=on_analyze,
-                cache_examples=True
+                # Cache each example on its first click instead of analyzing them all at launch
+                cache_examples="lazy"
             )
     
+    # Bound the queue so a burst of uploads is turned away instead of piling up, and let
+    # events without their own limit (such as example clicks) use every analysis worker
+    app.queue(max_size=32, default_concurrency_limit=_ANALYSIS_WORKERS)
+    
     return app